@@ -1,7 +1,10 @@
+import io
+import asyncio
 import streamlit as st
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from supabase import create_client, Client
+from datetime import datetime, timedelta
+from supabase import acreate_client, create_client, Client
 
 
 # --- Configure page layout ---
@@ -20,7 +23,7 @@ st.markdown(
     .main { padding-top: 0rem; }
     .block-container { padding-top: 1rem; padding-bottom: 0rem; padding-left: 1rem; padding-right: 1rem; max-width: 100%; }
     h1, h2, h3 { margin-top: 0.5rem; margin-bottom: 0.5rem; }
-    [data-testid="stDataFrame"] { height: auto; }
+    [data-testid="stDataFrame"] { height: auto; content-visibility: auto; contain-intrinsic-size: auto 300px; }
     .streamlit-expanderHeader { padding: 0.5rem 0rem; }
     .stMarkdown { margin-bottom: 0.5rem; }
     .stTextInput > div > div > input,
@@ -44,16 +47,36 @@ st.markdown(
         color: #4B6EAF !important;
         font-size: 0.95rem !important;
     }
+    .metric-container { display: flex; flex-wrap: wrap; gap: 10px; margin-bottom: 10px; }
+    .metric-card {
+        flex: 1;
+        min-width: 160px;
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 1.5rem;
+        border-radius: 8px;
+        color: white;
+        text-align: center;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }
+    .metric-card:nth-child(2) { background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); }
+    .metric-card:nth-child(3) { background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); }
+    .metric-card:nth-child(4) { background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%); }
+    .metric-card:nth-child(5) { background: linear-gradient(135deg, #fa709a 0%, #fee140 100%); }
+    .metric-label { font-size: 0.85rem; opacity: 0.9; margin-bottom: 0.5rem; font-weight: 600; }
+    .metric-value { font-size: 1.8rem; font-weight: 700; }
     </style>
     """,
     unsafe_allow_html=True
 )
 
 
-# Initialize Supabase client
-url = st.secrets["SUPABASE_URL"]
-key = st.secrets["SUPABASE_KEY"]
-supabase: Client = create_client(url, key)
+# Initialize Supabase client once per process, so reruns reuse its HTTP connection pool
+@st.cache_resource
+def init_supabase() -> Client:
+    return create_client(st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"])
+
+
+supabase: Client = init_supabase()
 
 
 # --- Title and subtitle
@@ -78,6 +101,230 @@ PAYMENT_CHOICES = [
 
 RIDERS = ['Bless', 'Other']
 
+# Per payment mode, (cost, fee, tip) multipliers for what the rider owes the company
+# (company_gets) and what the company owes the rider (rider_gets). With a split payment
+# each side already holds its own share, so nothing is owed either way.
+SHARE_RULES = {
+    'All to Company (MoMo/Bank)': ((0, 0, 0), (0, 1, 1)),
+    'All to Rider (Cash)': ((1, 0, 0), (0, 0, 0)),
+    'Split: Item to Company, Delivery+Tip to Rider': ((0, 0, 0), (0, 0, 0)),
+}
+# The same multipliers as arrays indexed by position in PAYMENT_CHOICES. The trailing
+# zero row is what -1 (get_indexer's answer for a mode outside PAYMENT_CHOICES) picks up.
+COMPANY_COEFS = np.array([SHARE_RULES[mode][0] for mode in PAYMENT_CHOICES] + [(0, 0, 0)], dtype='float64')
+RIDER_COEFS = np.array([SHARE_RULES[mode][1] for mode in PAYMENT_CHOICES] + [(0, 0, 0)], dtype='float64')
+
+NUMERIC_COLS = ['cost_of_item', 'delivery_fee', 'tip', 'company_gets', 'rider_gets']
+TEXT_COLS = ['location', 'payment_mode', 'rider']
+
+# Columns the app reads from the sales table, in display order
+SALES_COLUMNS = ['id', 'date', 'location', 'cost_of_item', 'delivery_fee', 'tip',
+                 'payment_mode', 'company_gets', 'rider_gets', 'rider']
+
+# Columns a CSV import must provide; the shares are computed from them
+IMPORT_COLUMNS = ['date', 'location', 'cost_of_item', 'delivery_fee', 'tip', 'payment_mode', 'rider']
+IMPORT_AMOUNT_COLS = ['cost_of_item', 'delivery_fee', 'tip']
+IMPORT_BATCH_SIZE = 500
+IMPORT_CONCURRENCY = 4
+
+# Table headers for the sales columns
+DISPLAY_COLUMNS = {
+    'id': 'Id',
+    'date': 'Date',
+    'location': 'Location',
+    'cost_of_item': 'Cost Of Item',
+    'delivery_fee': 'Delivery Fee',
+    'tip': 'Tip',
+    'payment_mode': 'Payment Mode',
+    'company_gets': 'Company Gets',
+    'rider_gets': 'Rider Gets',
+    'rider': 'Rider',
+}
+# Dates stay datetime64 and are formatted in the browser rather than with strftime per row
+DISPLAY_COLUMN_CONFIG = {'Date': st.column_config.DateColumn(format='ddd, DD/MM/YYYY')}
+
+# Summary cards as (label, column summed), rendered together in one flex row
+METRIC_CARDS = [
+    ('🚚 Total Delivery Fees', 'delivery_fee'),
+    ('💰 Total Sales', 'cost_of_item'),
+    ('💵 Total Tips', 'tip'),
+    ('🏢 Rider Owes Company', 'company_gets'),
+    ('🚴 Company Owes Rider', 'rider_gets'),
+]
+METRIC_CARD_TEMPLATE = "<div class='metric-card'><div class='metric-label'>{label}</div><div class='metric-value'>₵{value:,.2f}</div></div>"
+
+
+def compute_shares_vec(modes, costs, fees, tips):
+    """Return (company_gets, rider_gets) arrays for whole columns of sales."""
+    codes = pd.Index(PAYMENT_CHOICES).get_indexer(modes)
+    amounts = np.column_stack([costs, fees, tips]).astype('float64')
+    company_gets = (amounts * COMPANY_COEFS[codes]).sum(axis=1)
+    rider_gets = (amounts * RIDER_COEFS[codes]).sum(axis=1)
+    return company_gets, rider_gets
+
+
+def compute_shares(mode, cost, fee, tip):
+    """Return (company_gets, rider_gets) for a sale."""
+    company_gets, rider_gets = compute_shares_vec([mode], [cost], [fee], [tip])
+    return float(company_gets[0]), float(rider_gets[0])
+
+
+def load_typed(df):
+    """Coerce the raw Supabase rows into the column types the page works with."""
+    # Postgres sends ISO dates; naming the format skips pandas' per-value format inference
+    df['date'] = pd.to_datetime(df['date'], format='ISO8601', errors='coerce')
+    # The numbers already arrive parsed, so one block cast replaces per-column to_numeric
+    df[NUMERIC_COLS] = df[NUMERIC_COLS].astype('float64')
+    # Low-cardinality text columns as categoricals so the sidebar .isin filters compare integer codes
+    # Modes outside PAYMENT_CHOICES (legacy or blank) are masked first; pandas is deprecating them as values
+    modes = df['payment_mode']
+    df['payment_mode'] = pd.Categorical(modes.where(modes.isin(PAYMENT_CHOICES)), categories=PAYMENT_CHOICES)
+    df['location'] = df['location'].astype('category')
+    df['rider'] = df['rider'].astype('category')
+    return df
+
+
+def read_csv_response(response):
+    """DataFrame from a PostgREST .csv() response; empty when no rows came back."""
+    if not response.data:
+        return pd.DataFrame()
+    # Only an empty date or amount is missing. Text is read verbatim, so a blank location stays ''
+    # and one named 'NA' or 'None' keeps its name; pandas cannot tell a NULL cell from '' here,
+    # so both come back as ''.
+    return pd.read_csv(
+        io.StringIO(response.data),
+        dtype=dict.fromkeys(TEXT_COLS, str),
+        keep_default_na=False,
+        na_values=dict.fromkeys(['date'] + NUMERIC_COLS, ['']),
+    )
+
+
+# Reads ask PostgREST for CSV, which pandas parses in C instead of walking a list of JSON dicts
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_filter_options():
+    """Distinct sale dates and locations for the sidebar, from a two-column query."""
+    response = supabase.table("sales").select("date,location").csv().execute()
+    options = read_csv_response(response)
+    if options.empty:
+        return [], []
+    # Dedupe and sort as datetime64 days; tolist() yields the datetime.date values the slider shows
+    days = pd.to_datetime(options['date'], format='ISO8601', errors='coerce').values.astype('datetime64[D]')
+    unique_dates = np.unique(days[~np.isnat(days)]).tolist()
+    locations = sorted(options['location'].dropna().unique())
+    return unique_dates, locations
+
+
+@st.cache_data(ttl=300, show_spinner=False, max_entries=32)
+def fetch_sales_data(start_date, end_date):
+    """Sales dated start_date..end_date inclusive, newest first; the range is filtered by Postgres."""
+    response = (
+        supabase.table("sales")
+        .select(",".join(SALES_COLUMNS))
+        .gte("date", start_date.isoformat())
+        .lt("date", (end_date + timedelta(days=1)).isoformat())
+        .order("date", desc=True)
+        .csv()
+        .execute()
+    )
+    # Cache the typed frame, so a cache hit skips parsing and coercion.
+    # Indexed by id so the edit panel looks records up with a hash probe.
+    sales = read_csv_response(response)
+    if sales.empty:
+        return pd.DataFrame()
+    return load_typed(sales).set_index('id', drop=False)
+
+
+def prepare_import_rows(imported):
+    """Turn an uploaded CSV into insertable sales rows.
+
+    Returns (rows, the file row number of each, {skip reason: rows skipped}); the header is row 1.
+    """
+    rows = imported[IMPORT_COLUMNS].copy()
+    # Dates must be ISO (YYYY-MM-DD); other layouts are skipped rather than guessed from the first row
+    rows['date'] = pd.to_datetime(rows['date'], format='ISO8601', errors='coerce').dt.strftime('%Y-%m-%d')
+    # A blank amount counts as 0, but one that is not a number at all is rejected
+    amounts = rows[IMPORT_AMOUNT_COLS].apply(pd.to_numeric, errors='coerce')
+    checks = {
+        'an unreadable date': rows['date'].notna(),
+        'an unknown payment mode': rows['payment_mode'].isin(PAYMENT_CHOICES),
+        'an unknown rider': rows['rider'].isin(RIDERS),
+        'a non-numeric amount': (amounts.notna() | rows[IMPORT_AMOUNT_COLS].isna()).all(axis=1),
+    }
+    # A row failing several checks is counted once, under the first
+    keep = pd.Series(True, index=rows.index)
+    skipped = {}
+    for reason, valid in checks.items():
+        skipped[reason] = int((keep & ~valid).sum())
+        keep &= valid
+    rows = rows[keep]
+    rows['location'] = rows['location'].fillna('')
+    rows[IMPORT_AMOUNT_COLS] = amounts[keep].fillna(0.0).astype('float64')
+    rows['company_gets'], rows['rider_gets'] = compute_shares_vec(
+        rows['payment_mode'], rows['cost_of_item'], rows['delivery_fee'], rows['tip']
+    )
+    # NaN is not valid JSON, so blank cells go to Supabase as null
+    rows = rows.astype(object).where(rows.notna(), None)
+    return rows.to_dict('records'), (rows.index + 2).tolist(), skipped
+
+
+async def insert_batches_async(batches):
+    """Send the batches concurrently, at most IMPORT_CONCURRENCY requests in flight.
+
+    Returns one result per batch: the number of rows inserted, or the exception that rejected it.
+    """
+    client = await acreate_client(st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"])
+    limit = asyncio.Semaphore(IMPORT_CONCURRENCY)
+
+    async def insert(batch):
+        async with limit:
+            response = await client.table("sales").insert(batch).execute()
+            return len(response.data or [])
+
+    try:
+        # A rejected batch comes back as its exception, so the other batches still finish
+        return await asyncio.gather(*(insert(batch) for batch in batches), return_exceptions=True)
+    finally:
+        await client.postgrest.aclose()
+
+
+def insert_sales_batch(rows, batch_size=IMPORT_BATCH_SIZE):
+    """Insert rows batch_size at a time, one PostgREST request per batch.
+
+    Returns (rows inserted, failures), each failure being (first, last, error) with first and
+    last the positions in rows of a rejected batch.
+    """
+    starts = range(0, len(rows), batch_size)
+    batches = [rows[start:start + batch_size] for start in starts]
+    if len(batches) > 1:
+        results = asyncio.run(insert_batches_async(batches))
+    elif batches:
+        # A single request gains nothing from an async client; a rejection is kept like a gathered one
+        try:
+            results = [len(supabase.table("sales").insert(rows).execute().data or [])]
+        except Exception as exc:
+            results = [exc]
+    else:
+        results = []
+    inserted = sum(result for result in results if not isinstance(result, BaseException))
+    # APIError carries the server's message; anything else (e.g. a network error) is shown as is
+    failures = [
+        (start, start + len(batch) - 1, getattr(result, 'message', None) or str(result))
+        for start, batch, result in zip(starts, batches, results)
+        if isinstance(result, BaseException)
+    ]
+    return inserted, failures
+
+
+def clear_sales_cache():
+    """Drop cached query results after an insert, update or delete."""
+    fetch_filter_options.clear()
+    fetch_sales_data.clear()
+
+
+def format_display_df(df):
+    """df for display with Title Case column names; dates are formatted by DISPLAY_COLUMN_CONFIG."""
+    return df.rename(columns=DISPLAY_COLUMNS)
+
 
 # --- Add a sale form with modern styling ---
 st.markdown(
@@ -112,18 +359,7 @@ with st.form("sale_form", clear_on_submit=True):
 
 
 if submitted:
-    if mode == 'All to Company (MoMo/Bank)':
-        company_gets = 0.0
-        rider_gets = fee + tip
-    elif mode == 'All to Rider (Cash)':
-        company_gets = cost
-        rider_gets = 0.0
-    elif mode == 'Split: Item to Company, Delivery+Tip to Rider':
-        company_gets = 0.0
-        rider_gets = 0.0
-    else:
-        company_gets = 0.0
-        rider_gets = 0.0
+    company_gets, rider_gets = compute_shares(mode, cost, fee, tip)
 
 
     data = {
@@ -139,59 +375,163 @@ if submitted:
     }
     response = supabase.table("sales").insert(data).execute()
     if response.data:
+        clear_sales_cache()
         st.success("✅ Sale added successfully!")
     else:
         st.error("❌ Failed to add sale.")
         st.write(response)
 
 
-# --- Fetch all sales ---
-response = supabase.table("sales").select("*").order("date", desc=True).execute()
-df = pd.DataFrame(response.data) if response.data else pd.DataFrame()
+# --- Bulk import from CSV ---
+with st.expander("📥 Import Sales from CSV", expanded=False):
+    st.caption(f"Expected columns: {', '.join(IMPORT_COLUMNS)}. Dates as YYYY-MM-DD. Rows whose payment "
+               "mode or rider does not match the form's options are skipped.")
+    upload = st.file_uploader("CSV file", type="csv", key='import_csv')
+    if upload is not None and st.button("📥 Import Sales", type="primary"):
+        # Text cells are kept verbatim, so a location named 'NA' is not read as missing; only blank amounts are
+        imported = pd.read_csv(upload, dtype=dict.fromkeys(['date'] + TEXT_COLS, str), keep_default_na=False,
+                               na_values=dict.fromkeys(IMPORT_AMOUNT_COLS, ['']))
+        missing = [col for col in IMPORT_COLUMNS if col not in imported]
+        if missing:
+            st.error(f"❌ Missing columns: {', '.join(missing)}")
+        else:
+            rows, file_rows, skipped = prepare_import_rows(imported)
+            try:
+                inserted, failures = insert_sales_batch(rows)
+            finally:
+                # Whatever was written before a failure is committed, so the cache is stale either way
+                clear_sales_cache()
+            if failures:
+                failed = sum(last - first + 1 for first, last, _ in failures)
+                details = "\n".join(
+                    f"- File rows {file_rows[first]}–{file_rows[last]}: {error}" for first, last, error in failures
+                )
+                st.error(f"❌ Imported {inserted} of {len(rows)} sales; {failed} were rejected. Every other row "
+                         f"was imported, so retry with only these rows or the rest will be duplicated:\n{details}")
+            else:
+                st.success(f"✅ Imported {inserted} of {len(rows)} sales.")
+            for reason, count in skipped.items():
+                if count:
+                    st.warning(f"⚠️ Skipped {count} rows with {reason}.")
 
 
-if df.empty:
+# --- Edit/delete panel: a fragment, so typing in it reruns only this section ---
+@st.fragment
+def edit_delete_panel(df_indexed):
+    with st.expander("📝 Edit or Delete a Sale Record", expanded=False):
+        selected_id = st.number_input("🔍 Enter Sale ID", min_value=1, step=1, key='select_id', help="Enter the ID of the record you want to edit or delete")
+        if selected_id in df_indexed.index:
+            edit_row = df_indexed.loc[[selected_id]]
+        else:
+            edit_row = df_indexed.iloc[:0]
+        if not edit_row.empty:
+            st.markdown("#### 📄 Selected Record")
+            st.dataframe(format_display_df(edit_row), use_container_width=True, hide_index=True,
+                         column_config=DISPLAY_COLUMN_CONFIG)
+            st.markdown("---")
+            st.markdown("#### ✏️ Edit Record Details")
+            # A form, so editing the fields does not rerun anything until a button is pressed
+            with st.form("edit_form"):
+                edit_col1, edit_col2 = st.columns(2)
+                with edit_col1:
+                    st.markdown("<div style='background-color: #f8f9fa; padding: 1rem; border-radius: 8px;'>", unsafe_allow_html=True)
+                    new_loc = st.text_input("📍 Location", value=str(edit_row['location'].values[0]), key=f'edit_loc_{selected_id}')
+                    new_cost = st.number_input("💰 Cost of Item", min_value=0.0, value=float(edit_row['cost_of_item'].values[0]), format='%.2f', key=f'edit_cost_{selected_id}')
+                    new_fee = st.number_input("🚚 Delivery Fee", min_value=0.0, value=float(edit_row['delivery_fee'].values[0]), format='%.2f', key=f'edit_fee_{selected_id}')
+                    st.markdown("</div>", unsafe_allow_html=True)
+                with edit_col2:
+                    st.markdown("<div style='background-color: #f8f9fa; padding: 1rem; border-radius: 8px;'>", unsafe_allow_html=True)
+                    new_tip = st.number_input("💵 Tip", min_value=0.0, value=float(edit_row['tip'].values[0]), format='%.2f', key=f'edit_tip_{selected_id}')
+                    selected_mode = edit_row['payment_mode'].values[0]
+                    if selected_mode in PAYMENT_CHOICES:
+                        default_index = PAYMENT_CHOICES.index(selected_mode)
+                    else:
+                        default_index = 0
+                    new_mode = st.radio("💳 Payment Mode", PAYMENT_CHOICES, index=default_index, key=f'edit_mode_{selected_id}')
+                
+                    # Get current rider for editing
+                    current_rider = edit_row['rider'].values[0]
+                    if current_rider in RIDERS:
+                        rider_default_index = RIDERS.index(current_rider)
+                    else:
+                        rider_default_index = 0
+                    new_rider = st.radio("🚴 Rider", RIDERS, horizontal=True, index=rider_default_index, key=f'edit_rider_{selected_id}')
+                    st.markdown("</div>", unsafe_allow_html=True)
+                st.markdown("---")
+                btn_col1, btn_col2, btn_col3 = st.columns([1, 1, 2])
+                with btn_col1:
+                    update_clicked = st.form_submit_button("✅ Update Record", type="primary", use_container_width=True)
+                with btn_col2:
+                    delete_clicked = st.form_submit_button("🗑️ Delete Record", type="secondary", use_container_width=True)
+            if update_clicked:
+                # Calculate based on payment mode
+                company_gets, rider_gets = compute_shares(new_mode, new_cost, new_fee, new_tip)
+                update_data = {
+                    "location": new_loc,
+                    "cost_of_item": new_cost,
+                    "delivery_fee": new_fee,
+                    "tip": new_tip,
+                    "payment_mode": new_mode,
+                    "company_gets": company_gets,
+                    "rider_gets": rider_gets,
+                    "rider": new_rider
+                }
+                response = supabase.table("sales").update(update_data).eq("id", int(selected_id)).execute()
+                if response.data:
+                    clear_sales_cache()
+                    st.success("✅ Record updated successfully!")
+                    st.rerun()
+                else:
+                    st.error("❌ Failed to update record.")
+                    st.write(response)
+            if delete_clicked:
+                response = supabase.table("sales").delete().eq("id", int(selected_id)).execute()
+                if response.data:
+                    clear_sales_cache()
+                    st.success("🗑️ Record deleted successfully!")
+                    st.rerun()
+                else:
+                    st.error("❌ Failed to delete record.")
+                    st.write(response)
+        else:
+            st.info("ℹ️ Please enter a valid Sale ID from the filtered records above to edit or delete.")
+
+
+# --- Fetch sales for the selected date range ---
+unique_dates, all_locations = fetch_filter_options()
+
+
+if not unique_dates:
     st.info('📭 No data yet. Add your first sale above.')
 else:
     st.sidebar.header('🔍 Filter')
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    for col in ['cost_of_item', 'delivery_fee', 'tip', 'company_gets', 'rider_gets']:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-
-
-    unique_dates = sorted(df['date'].dt.date.dropna().unique())
-    if unique_dates:
-        start_date, end_date = st.sidebar.select_slider(
-            'Select Date Range',
-            options=unique_dates,
-            value=(unique_dates[0], unique_dates[-1])
-        )
-    else:
-        start_date, end_date = None, None
+    start_date, end_date = st.sidebar.select_slider(
+        'Select Date Range',
+        options=unique_dates,
+        value=(unique_dates[0], unique_dates[-1])
+    )
 
 
-    locations = st.sidebar.multiselect('Locations', sorted(df['location'].dropna().unique()), default=None)
+    locations = st.sidebar.multiselect('Locations', all_locations, default=None)
     payment_modes = st.sidebar.multiselect('Payment Mode', PAYMENT_CHOICES, default=None)
     riders_filter = st.sidebar.multiselect('Riders', RIDERS, default=None)
 
 
-    if start_date and end_date:
-        mask = (df['date'].dt.date >= start_date) & (df['date'].dt.date <= end_date)
-        if locations:
-            mask &= df['location'].isin(locations)
-        if payment_modes:
-            mask &= df['payment_mode'].isin(payment_modes)
-        if riders_filter:
-            mask &= df['rider'].isin(riders_filter)
-        filtered = df[mask]
+    # The date range is applied by the query; the multiselects filter the cached rows locally
+    df = fetch_sales_data(start_date, end_date)
+    if not df.empty:
+        conditions = [
+            df[col].isin(selected)
+            for col, selected in (('location', locations), ('payment_mode', payment_modes), ('rider', riders_filter))
+            if selected
+        ]
+        filtered = df[np.logical_and.reduce(conditions)] if conditions else df
     else:
         filtered = pd.DataFrame()
 
 
-    filtered_display = filtered.copy()
-    if not filtered_display.empty:
-        filtered_display['date'] = filtered_display['date'].dt.strftime('%a, %d/%m/%Y')
-        filtered_display = filtered_display.rename(columns=lambda x: ' '.join(word.capitalize() for word in x.split('_')))
+    if not filtered.empty:
+        filtered_display = format_display_df(filtered)
         
         st.markdown(
             """
@@ -205,7 +545,8 @@ else:
             unsafe_allow_html=True
         )
         with st.expander("View Table", expanded=True):
-            st.dataframe(filtered_display.reset_index(drop=True), use_container_width=True, height=300)
+            st.dataframe(filtered_display, use_container_width=True, height=300, hide_index=True,
+                         column_config=DISPLAY_COLUMN_CONFIG)
 
 
         st.markdown(
@@ -219,83 +560,12 @@ else:
             """,
             unsafe_allow_html=True
         )
-        st.markdown(
-            """
-            <style>
-            .metric-container { display: flex; gap: 10px; margin-bottom: 10px; }
-            .metric-card {
-                flex: 1;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                padding: 1.5rem;
-                border-radius: 8px;
-                color: white;
-                text-align: center;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            }
-            .metric-card:nth-child(2) { background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); }
-            .metric-card:nth-child(3) { background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); }
-            .metric-card:nth-child(4) { background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%); }
-            .metric-card:nth-child(5) { background: linear-gradient(135deg, #fa709a 0%, #fee140 100%); }
-            .metric-label { font-size: 0.85rem; opacity: 0.9; margin-bottom: 0.5rem; font-weight: 600; }
-            .metric-value { font-size: 1.8rem; font-weight: 700; }
-            </style>
-            """,
-            unsafe_allow_html=True
-        )
 
 
         # ---- Overall Summary Cards ----
-        col_sum1, col_sum2, col_sum3, col_sum4, col_sum5 = st.columns(5)
-        with col_sum1:
-            st.markdown(
-                f"""
-                <div class='metric-card'>
-                    <div class='metric-label'>🚚 Total Delivery Fees</div>
-                    <div class='metric-value'>₵{filtered['delivery_fee'].sum():,.2f}</div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-        with col_sum2:
-            st.markdown(
-                f"""
-                <div class='metric-card'>
-                    <div class='metric-label'>💰 Total Sales</div>
-                    <div class='metric-value'>₵{filtered['cost_of_item'].sum():,.2f}</div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-        with col_sum3:
-            st.markdown(
-                f"""
-                <div class='metric-card'>
-                    <div class='metric-label'>💵 Total Tips</div>
-                    <div class='metric-value'>₵{filtered['tip'].sum():,.2f}</div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-        with col_sum4:
-            st.markdown(
-                f"""
-                <div class='metric-card'>
-                    <div class='metric-label'>🏢 Rider Owes Company</div>
-                    <div class='metric-value'>₵{filtered['company_gets'].sum():,.2f}</div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-        with col_sum5:
-            st.markdown(
-                f"""
-                <div class='metric-card'>
-                    <div class='metric-label'>🚴 Company Owes Rider</div>
-                    <div class='metric-value'>₵{filtered['rider_gets'].sum():,.2f}</div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
+        totals = filtered[NUMERIC_COLS].sum()
+        cards = ''.join(METRIC_CARD_TEMPLATE.format(label=label, value=totals[col]) for label, col in METRIC_CARDS)
+        st.markdown(f"<div class='metric-container'>{cards}</div>", unsafe_allow_html=True)
 
 
         # ---- Per-Rider Breakdown ----
@@ -311,24 +581,18 @@ else:
             unsafe_allow_html=True
         )
         
-        # Calculate per-rider earnings
-        rider_summary = {}
-        for rider_name in RIDERS:
-            rider_data = filtered[filtered['rider'] == rider_name]
-            if not rider_data.empty:
-                rider_summary[rider_name] = {
-                    'deliveries': len(rider_data),
-                    'delivery_fees': rider_data['delivery_fee'].sum(),
-                    'tips': rider_data['tip'].sum(),
-                    'earnings': rider_data['rider_gets'].sum()
-                }
-            else:
-                rider_summary[rider_name] = {
-                    'deliveries': 0,
-                    'delivery_fees': 0.0,
-                    'tips': 0.0,
-                    'earnings': 0.0
-                }
+        # Calculate per-rider earnings in one groupby over the categorical rider codes
+        rider_summary = (
+            filtered.groupby('rider', observed=False)
+            .agg(
+                deliveries=('rider', 'size'),
+                delivery_fees=('delivery_fee', 'sum'),
+                tips=('tip', 'sum'),
+                earnings=('rider_gets', 'sum')
+            )
+            .reindex(RIDERS, fill_value=0)
+            .to_dict('index')
+        )
         
         # Display per-rider cards
         rider_cols = st.columns(len(RIDERS))
@@ -387,95 +651,4 @@ else:
         """,
         unsafe_allow_html=True
     )
-    with st.expander("📝 Edit or Delete a Sale Record", expanded=False):
-        st.markdown(
-            """
-            <style>
-            .stNumberInput > label, .stTextInput > label, .stSelectbox > label {
-                font-weight: 600;
-                color: #4B6EAF;
-            }
-            </style>
-            """,
-            unsafe_allow_html=True
-        )
-        selected_id = st.number_input("🔍 Enter Sale ID", min_value=1, step=1, key='select_id', help="Enter the ID of the record you want to edit or delete")
-        edit_row = filtered[filtered['id'] == selected_id]
-        if not edit_row.empty:
-            st.markdown("#### 📄 Selected Record")
-            edit_row_display = edit_row.copy()
-            edit_row_display['date'] = edit_row_display['date'].dt.strftime('%a, %d/%m/%Y')
-            edit_row_display = edit_row_display.rename(columns=lambda x: ' '.join(word.capitalize() for word in x.split('_')))
-            st.dataframe(edit_row_display, use_container_width=True)
-            st.markdown("---")
-            st.markdown("#### ✏️ Edit Record Details")
-            edit_col1, edit_col2 = st.columns(2)
-            with edit_col1:
-                st.markdown("<div style='background-color: #f8f9fa; padding: 1rem; border-radius: 8px;'>", unsafe_allow_html=True)
-                new_loc = st.text_input("📍 Location", value=str(edit_row['location'].values[0]), key=f'edit_loc_{selected_id}')
-                new_cost = st.number_input("💰 Cost of Item", min_value=0.0, value=float(edit_row['cost_of_item'].values[0]), format='%.2f', key=f'edit_cost_{selected_id}')
-                new_fee = st.number_input("🚚 Delivery Fee", min_value=0.0, value=float(edit_row['delivery_fee'].values[0]), format='%.2f', key=f'edit_fee_{selected_id}')
-                st.markdown("</div>", unsafe_allow_html=True)
-            with edit_col2:
-                st.markdown("<div style='background-color: #f8f9fa; padding: 1rem; border-radius: 8px;'>", unsafe_allow_html=True)
-                new_tip = st.number_input("💵 Tip", min_value=0.0, value=float(edit_row['tip'].values[0]), format='%.2f', key=f'edit_tip_{selected_id}')
-                selected_mode = edit_row['payment_mode'].values[0]
-                if selected_mode in PAYMENT_CHOICES:
-                    default_index = PAYMENT_CHOICES.index(selected_mode)
-                else:
-                    default_index = 0
-                new_mode = st.radio("💳 Payment Mode", PAYMENT_CHOICES, index=default_index, key=f'edit_mode_{selected_id}')
-                
-                # Get current rider for editing
-                current_rider = edit_row['rider'].values[0]
-                if current_rider in RIDERS:
-                    rider_default_index = RIDERS.index(current_rider)
-                else:
-                    rider_default_index = 0
-                new_rider = st.radio("🚴 Rider", RIDERS, horizontal=True, index=rider_default_index, key=f'edit_rider_{selected_id}')
-                st.markdown("</div>", unsafe_allow_html=True)
-            # Calculate based on payment mode
-            if new_mode == 'All to Company (MoMo/Bank)':
-                company_gets = 0.0
-                rider_gets = new_fee + new_tip
-            elif new_mode == 'All to Rider (Cash)':
-                company_gets = new_cost
-                rider_gets = 0.0
-            elif new_mode == 'Split: Item to Company, Delivery+Tip to Rider':
-                company_gets = 0.0
-                rider_gets = 0.0
-            else:
-                company_gets = 0.0
-                rider_gets = 0.0
-            st.markdown("---")
-            btn_col1, btn_col2, btn_col3 = st.columns([1, 1, 2])
-            with btn_col1:
-                if st.button("✅ Update Record", type="primary", use_container_width=True):
-                    update_data = {
-                        "location": new_loc,
-                        "cost_of_item": new_cost,
-                        "delivery_fee": new_fee,
-                        "tip": new_tip,
-                        "payment_mode": new_mode,
-                        "company_gets": company_gets,
-                        "rider_gets": rider_gets,
-                        "rider": new_rider
-                    }
-                    response = supabase.table("sales").update(update_data).eq("id", int(selected_id)).execute()
-                    if response.data:
-                        st.success("✅ Record updated successfully!")
-                        st.rerun()
-                    else:
-                        st.error("❌ Failed to update record.")
-                        st.write(response)
-            with btn_col2:
-                if st.button("🗑️ Delete Record", type="secondary", use_container_width=True):
-                    response = supabase.table("sales").delete().eq("id", int(selected_id)).execute()
-                    if response.data:
-                        st.success("🗑️ Record deleted successfully!")
-                        st.rerun()
-                    else:
-                        st.error("❌ Failed to delete record.")
-                        st.write(response)
-        else:
-            st.info("ℹ️ Please enter a valid Sale ID from the filtered records above to edit or delete.")
+    edit_delete_panel(filtered)
@@ -0,0 +1,6 @@
+-- Indexes for the queries sales_tracker.py sends to the sales table.
+--
+-- fetch_sales_data(): where date >= start and date < end + 1, order by date desc.
+-- fetch_filter_options(): select date, location. With location in the index this
+-- can be answered by an index-only scan instead of reading every heap row.
+create index if not exists sales_date_desc_location on public.sales (date desc, location);